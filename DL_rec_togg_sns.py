@@ -1,28 +1,65 @@
+import array
+import atexit
+import logging
 import os
-import re
 import serial
 import serial.tools.list_ports
+import struct
+import sys
 import time
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dynamixel_sdk import *
+from collections import namedtuple
 from enum import Enum
 
+__all__ = [
+	"CommunicationStatus", "DeviceError", "SNS_ranges", "PortSpec", "PORT_SPECS",
+	"probe_port", "connect_dev", "disconnect_dev", "set_low_latency",
+	"txrx_result_msg", "rx_packet_error_msg",
+	"find_port_sns", "get_valid_delta_range", "wait_sns_ready", "toggle_sns", "read_sensor_data",
+	"same_file", "open_data_file", "close_data_files", "write_data_to_file", "verify_data_written",
+	"deinit_mes_sns", "recorder_reset", "stop_and_reset", "pause_script", "main",
+]
+
+log = logging.getLogger(__name__)
+
 # Constants
 DXL_ID = 171
 BAUDRATE = 115200
 PROTOCOL_VERSION = 2.0
-DEF_TMO = 100
+DEF_TMO = 1
+
+# USB identifiers of the ROBOTIS U2D2 adapter (FTDI FT232H)
+U2D2_VID = 0x0403
+U2D2_PID = 0x6014
+# Device name prefix of USB serial adapters on macOS, used when no VID:PID match is found
+USBSERIAL_PREFIX = '/dev/cu.usbserial'
 
 DX_RESET_CMD = 23
 DX_MEAS_START_STOP = 24
 DX_TEMP_PORT_ID = 25
 
 DX_SENSORS_STATUS = 83
+# ASSUMPTION: bit 0 of DX_SENSORS_STATUS is taken to mean "heater settled".
+# Not confirmed against the recorder firmware; verify before relying on it,
+# since a bit with another meaning would cut the warm-up short. If the bit is
+# never set, the warm-up simply runs its full timeout as before.
+SNS_READY_MASK = 0x01
 DX_SENSORS_DATA_FIRST = 85
 DX_SENSOR_DATA_LAST = 124
 DX_UPD_COMMAND = 125
 
 SNS_ETHANOL_ID = 46
 
+# Layout of one sensor data register: two little-endian 16-bit values
+PAIR_STRUCT = struct.Struct('<HH')
+# Line format of one pair in the data file
+PAIR_LINE_TEMPLATE = b"Pair %d: %6d, %6d\n"
+
+# File descriptors of the data files, opened once per session
+_data_fds = {}
+
 # Port related constants
 PORT_REGISTERS = {
 	51: "Port1",
@@ -43,6 +80,15 @@ PORT_REGISTERS_RANGES = {
 	"Port4S": {"SNS_ID": 79, "SEL_RANGE": 81}
 }
 
+# Flat, ordered view of PORT_REGISTERS_RANGES used at runtime
+PortSpec = namedtuple('PortSpec', 'name sns_id sel_range')
+PORT_SPECS = tuple(PortSpec(name, regs["SNS_ID"], regs["SEL_RANGE"]) for name, regs in PORT_REGISTERS_RANGES.items())
+PORT_SNS_IDS = array.array('H', [spec.sns_id for spec in PORT_SPECS])
+# Contiguous register block holding every SNS_ID, and each port's offset into it
+SNS_ID_BLOCK_START = min(PORT_SNS_IDS)
+SNS_ID_BLOCK_LEN = max(PORT_SNS_IDS) + 2 - SNS_ID_BLOCK_START
+PORT_SNS_OFFSETS = tuple((spec.sns_id - SNS_ID_BLOCK_START, spec) for spec in PORT_SPECS)
+
 # Define communication statuses as an enum
 class CommunicationStatus(Enum):
 	SUCCESS = 0
@@ -72,13 +118,81 @@ class SNS_ranges(Enum):
 
 
 def pause_script(message="Pausing script. Press Enter to continue..."):
-	#print(message)
-	input("Pausing script. Press Enter to continue...")
+	input(message)
+
+def set_low_latency(portHandler):
+	"""Enable ASYNC_LOW_LATENCY on the opened port so the FTDI latency timer drops to 1 ms (Linux only)."""
+	if not sys.platform.startswith('linux'):
+		return
+	try:
+		portHandler.ser.set_low_latency_mode(True)
+	except ValueError as e:
+		log.warning("Low latency mode not available: %s", e)
+
+def probe_port(device, dxl_id, baudrate):
+	"""
+	Open a single serial port and ping the device on it.
+	
+	Parameters:
+		device (str): The serial device path to probe.
+		dxl_id (int): The ID of the device to ping.
+		baudrate (int): The baud rate for the connection.
+	
+	Returns:
+		tuple: (PortHandler, PacketHandler) if the device answered, None otherwise.
+	"""
+	log.info("Trying port: %s", device)
+	# Initialize PortHandler and PacketHandler
+	portHandler = PortHandler(device)
+	packetHandler = PacketHandler(PROTOCOL_VERSION)
+	found = False
+	try:
+		# setBaudRate() opens the port at the requested rate, a separate openPort() would reopen it
+		if not portHandler.setBaudRate(baudrate):
+			log.error("Unsupported baud rate %d on port %s", baudrate, device)
+			return None
+		# Bound writes on the SDK's serial object so a stuck adapter raises instead of blocking the probe
+		portHandler.ser.write_timeout = DEF_TMO
+		set_low_latency(portHandler)
+		
+		# Ping device
+		outping_data, dxl_comm_result, dxl_error = packetHandler.ping(portHandler, dxl_id)
+		if dxl_comm_result == COMM_SUCCESS:
+			log.info("Device found on port %s!", device)
+			found = True
+			return portHandler, packetHandler
+			
+		log.info("No device on port %s", device)
+		
+	except serial.SerialException as e:
+		log.error("Serial error: %s", e)
+	except Exception as e:
+		log.error("Unexpected error: %s", e)
+	finally:
+		# Close the port on every path that does not hand it to the caller
+		if not found and portHandler.is_open:
+			try:
+				portHandler.closePort()
+			except (serial.SerialException, OSError) as e:
+				log.error("Error closing port %s: %s", device, e)
+	
+	return None
+
+def _close_probe_result(future):
+	"""Close the port of a probe that finished after another port already won."""
+	if future.cancelled() or future.exception() is not None:
+		return
+	result = future.result()
+	if result:
+		result[0].closePort()
 
 def connect_dev(dxl_id, baudrate):
 	"""
 	Connect to the device using available COM ports.
 	
+	All matching ports are probed concurrently, so an unresponsive adapter
+	only costs a single port timeout instead of stalling the whole scan.
+	
 	Parameters:
 		dxl_id (int): The ID of the device to connect to.
 		baudrate (int): The baud rate for the connection.
@@ -86,75 +200,85 @@ def connect_dev(dxl_id, baudrate):
 	Returns:
 		tuple: (PortHandler, PacketHandler) if the device is found, (None, None) otherwise.
 	"""
-	# Define the pattern to match specific serial ports
-	pattern = re.compile(r'^/dev/cu\.usbserial.*')
+	# Enumerate once, then prefer ports reporting the U2D2 VID:PID and fall back to the device name
+	ports = sorted(serial.tools.list_ports.comports(), key=lambda p: p.device)
+	devices = [port.device for port in ports if (port.vid, port.pid) == (U2D2_VID, U2D2_PID)]
+	if not devices:
+		devices = [port.device for port in ports if port.device.startswith(USBSERIAL_PREFIX)]
+	if not devices:
+		log.error("Device not found")
+		return None, None
 	
-	for port in sorted(serial.tools.list_ports.comports(), key=lambda p: p.device):
-		if pattern.match(port.device):
-			print(f"Trying port: {port.device}")
-			try:
-				# Create serial connection
-				ser = serial.Serial(port=port.device, baudrate=baudrate, timeout=100)
-				
-				# Initialize PortHandler and PacketHandler
-				portHandler = PortHandler(ser.name)
-				packetHandler = PacketHandler(PROTOCOL_VERSION)
-				
-				# Configure port handler and open port
-				portHandler.setBaudRate(baudrate)
-				portHandler.openPort()
-				
-				# Ping device
-				outping_data, dxl_comm_result, dxl_error = packetHandler.ping(portHandler, dxl_id)
-				if dxl_comm_result == COMM_SUCCESS:
-					print("Device found!")
-					return portHandler, packetHandler
-					
-				# If device not found, close port and continue
-				print(f"No device on port {port.device}")
-				portHandler.closePort()
-				ser.close()
-				
-			except serial.SerialException as e:
-				print(f"Serial error: {e}")
-			except Exception as e:
-				print(f"Unexpected error: {e}")
-			
-	print("Device not found")
+	executor = ThreadPoolExecutor(max_workers=len(devices))
+	futures = [executor.submit(probe_port, device, dxl_id, baudrate) for device in devices]
+	try:
+		for future in as_completed(futures):
+			result = future.result()
+			if result:
+				# Release every port that is still being probed or answered too late
+				for other in futures:
+					if other is not future and not other.cancel():
+						other.add_done_callback(_close_probe_result)
+				return result
+	finally:
+		executor.shutdown(wait=False)
+	
+	log.error("Device not found")
 	return None, None
 
+def disconnect_dev(portHandler):
+	"""Close the port so the next connect_dev can reopen it."""
+	if portHandler and portHandler.is_open:
+		portHandler.closePort()
+
+@lru_cache(maxsize=64)
+def txrx_result_msg(packetHandler, dxl_comm_result):
+	"""Cached packetHandler.getTxRxResult() text for a communication result code."""
+	return packetHandler.getTxRxResult(dxl_comm_result)
+
+@lru_cache(maxsize=64)
+def rx_packet_error_msg(packetHandler, dxl_error):
+	"""Cached packetHandler.getRxPacketError() text for a device error byte."""
+	return packetHandler.getRxPacketError(dxl_error)
+
 def find_port_sns(dxl_id, portHandler, packetHandler, sns_id_desired):
 	"""Find the port where the sensor with the desired ID is connected."""
-	print(f"Checking where sensor {sns_id_desired} is connected.")
+	log.info("Checking where sensor %d is connected.", sns_id_desired)
 	
 	time.sleep(1)
+	# Read all SNS_ID registers with a single request covering the whole block
+	block_start = SNS_ID_BLOCK_START
+	block_len = SNS_ID_BLOCK_LEN
+	block, dxl_comm_result, dxl_error = packetHandler.readTxRx(portHandler, dxl_id, block_start, block_len)
+	
+	# Check for communication errors
+	if dxl_comm_result != COMM_SUCCESS:
+		comm_error_msg = txrx_result_msg(packetHandler, dxl_comm_result)
+		log.error("Communication error on registers %d-%d: %s (Error Code: %d)", block_start, block_start + block_len - 1, comm_error_msg, dxl_comm_result)
+		return None
+	
+	# Check for device errors
+	if dxl_error != 0:
+		try:
+			device_error = DeviceError(dxl_error).name
+		except ValueError:
+			# The SDK can report error bytes that DeviceError does not enumerate
+			device_error = rx_packet_error_msg(packetHandler, dxl_error)
+		log.error("Device error on registers %d-%d: %s (Error Code: %d)", block_start, block_start + block_len - 1, device_error, dxl_error)
+	
 	# Iterate through each port register to find the sensor
-	for port_name, registers in PORT_REGISTERS_RANGES.items():
+	for offset, spec in PORT_SNS_OFFSETS:
 		
-		port_id_curr = registers["SNS_ID"]
-		# Attempt to read the sensor ID from the current register
-		sns_id_curr, dxl_comm_result, dxl_error = packetHandler.read2ByteTxRx(portHandler, dxl_id, port_id_curr)
-		
-		# Check for communication errors
-		if CommunicationStatus(dxl_comm_result) != CommunicationStatus.SUCCESS:
-			comm_error_msg = packetHandler.getTxRxResult(dxl_comm_result)
-			print(f"Communication error on register {port_id_curr} ({port_name}): {comm_error_msg} (Error Code: {dxl_comm_result})")
-			continue  # Skip to the next register if there's a communication error
-		
-		# Check for device errors
-		if dxl_error != 0:
-			device_error = DeviceError(dxl_error)
-			print(f"Device error on register {port_id_curr} ({port_name}): {device_error.name} (Error Code: {device_error.value})")
-		else:
-			print(f"Successfully read from {port_name}: Sensor ID {sns_id_curr}")
+		sns_id_curr = DXL_MAKEWORD(block[offset], block[offset + 1])
+		log.debug("Successfully read from %s: Sensor ID %d", spec.name, sns_id_curr)
 		
 		# Check if the current sensor ID matches the desired sensor ID
 		if sns_id_curr == sns_id_desired:
-			print(f"Sensor {sns_id_desired} found on {port_name}.")
-			return port_name  # Return the register address if the sensor is found
+			log.info("Sensor %d found on %s.", sns_id_desired, spec.name)
+			return spec  # Return the port spec if the sensor is found
 	
 	# If no matching sensor is found after checking all ports
-	print(f"Sensor {sns_id_desired} not found on any port.")
+	log.error("Sensor %d not found on any port.", sns_id_desired)
 	return None
 	
 def get_valid_delta_range(prompt="What delta of ranges do you want to activate? ", min_value = 1, max_value = 16):
@@ -185,13 +309,41 @@ def get_valid_delta_range(prompt="What delta of ranges do you want to activate?
 			
 
 	
-def toggle_sns(dxl_id, portHandler, packetHandler, port_n):
+def wait_sns_ready(dxl_id, portHandler, packetHandler, timeout=60, poll_interval=1.0):
+	"""
+	Poll DX_SENSORS_STATUS until the sensor reports it is hot or the timeout expires.
+	
+	Parameters:
+		dxl_id (int): The ID of the device.
+		portHandler (PortHandler): Handler of the opened port.
+		packetHandler (PacketHandler): Packet handler for the protocol in use.
+		timeout (float): Maximum time to wait in seconds.
+		poll_interval (float): Pause between two status reads in seconds.
+	
+	Returns:
+		bool: True if the sensor reported ready, False if the timeout expired.
+	"""
+	start = time.monotonic()
+	deadline = start + timeout
+	while True:
+		status, dxl_comm_result, dxl_error = packetHandler.read1ByteTxRx(portHandler, dxl_id, DX_SENSORS_STATUS)
+		if dxl_comm_result == COMM_SUCCESS and dxl_error == 0 and status & SNS_READY_MASK:
+			log.info("Sensor ready after %.1f secs", time.monotonic() - start)
+			return True
+		
+		remaining = deadline - time.monotonic()
+		if remaining <= 0:
+			log.warning("Sensor not ready after %s secs", timeout)
+			return False
+		time.sleep(min(poll_interval, remaining))
+
+def toggle_sns(dxl_id, portHandler, packetHandler, port_spec, warmup_timeout=60, poll_interval=1.0):
 	"""Initialize and toggle the sensor, then read its data."""
-	print(f"Initializing and toggling sensor.")
+	log.info("Initializing and toggling sensor.")
 	
 		
-	sns_sel_range_id = PORT_REGISTERS_RANGES[port_n]["SEL_RANGE"]
-	print(f"Reg of port for select range - {sns_sel_range_id}")
+	sns_sel_range_id = port_spec.sel_range
+	log.debug("Reg of port for select range - %d", sns_sel_range_id)
 	
 	# Sample values for demonstration
 	# default_rang = SNS_ranges.RANGE_1.value + SNS_ranges.RANGE_2.value
@@ -206,131 +358,182 @@ def toggle_sns(dxl_id, portHandler, packetHandler, port_n):
 		delta_range = get_valid_delta_range()
 		dxl_comm_result, dxl_error = packetHandler.write2ByteTxRx(portHandler, dxl_id, sns_sel_range_id, delta_range)
 	else:
-		print(f"Default range - {bin(default_rang)}")
+		log.debug("Default range - %s", bin(default_rang))
 		dxl_comm_result, dxl_error = packetHandler.write2ByteTxRx(portHandler, dxl_id, sns_sel_range_id, default_rang)
 		
 	if dxl_comm_result != COMM_SUCCESS:
-		print(f"Error initializing sensor: {dxl_error}")
+		log.error("Error initializing sensor: %s", dxl_error)
 		return None
 		
-	print("Get Hot sensor...")
+	log.info("Get Hot sensor...")
 	
 	# Sensor initialization code here
-	for i in range(1, 7):
-		time.sleep(9)
-		outping_data, dxl_comm_result, dxl_error = packetHandler.ping(portHandler, dxl_id)
-		print(f"Spend {i*10} secs")
-		
-		# # check complete ping command
-		# if dxl_comm_result != COMM_SUCCESS:
-		# 	print(f"Communication error: {packetHandler.getTxRxResult(dxl_comm_result)}")
-		# elif dxl_error != 0:
-		# 	print(f"Device error: {packetHandler.getRxPacketError(dxl_error)}")
-		# else:
-		# 	print(f"Ping successful: {outping_data}")
+	if not wait_sns_ready(dxl_id, portHandler, packetHandler, warmup_timeout, poll_interval):
+		# The full warm-up time has elapsed, which is what the sensor always got before the status poll
+		log.warning("Sensor did not report ready, continuing after the full warm-up time.")
 				
 	pause_script("Sensor hot. Please touch the sensor and press Enter to continue...")
 	
-	print("Resuming data collection from the sensor...\n")
+	log.info("Resuming data collection from the sensor...")
 	
 	# Continue with sensor data collection or other tasks
 	dxl_comm_result, dxl_error = packetHandler.write1ByteTxRx(portHandler, dxl_id, DX_MEAS_START_STOP, 1)
 	if dxl_comm_result != COMM_SUCCESS:
-		print(f"Error starting measurement: {dxl_error}")
+		log.error("Error starting measurement: %s", dxl_error)
 		return None
 	else:
-		print(f"Start measuaring data from sensor")
+		log.info("Start measuaring data from sensor")
+		return True
 	
 def read_sensor_data(dxl_id, portHandler, packetHandler):
 	time.sleep(9)
-	for i in range(3):
-		
-		# calculate address shift
-		addr = DX_SENSORS_DATA_FIRST + (i * 4)
-		print(f"SNS_DATA_REG - {addr}")
-		vals_sns, dxl_comm_result, dxl_error = packetHandler.read4ByteTxRx(portHandler, dxl_id, addr)
-		if dxl_comm_result != COMM_SUCCESS:
-			print(f"Communication error: {packetHandler.getTxRxResult(dxl_comm_result)}")
-			return None
-		elif dxl_error != 0:
-			print(f"Error: {packetHandler.getRxPacketError(dxl_error)}")
-			return None
-		else:
-			print(f"Data: {hex(vals_sns)}")
-			# print(f"Data from reg: {vals_sns}")
-			# f_num = vals_sns & 0xFFFF
-			# s_num = (vals_sns >> 16) & 0xFFFF
-			# list_of_data = [f_num, s_num]
-			#list_of_data = [(vals_sns[i], vals_sns[i + 1]) for i in range(0, len(vals_sns), 2)]
-			#print(f"Two 2-byte numbers: {list_of_data}")
-			input("After read data from regs")
-			# return list_of_data
-		time.sleep(9)
+	# All three 4-byte values are updated together, so read them in one request
+	log.debug("SNS_DATA_REG - %d..%d", DX_SENSORS_DATA_FIRST, DX_SENSORS_DATA_FIRST + 11)
+	data, dxl_comm_result, dxl_error = packetHandler.readTxRx(portHandler, dxl_id, DX_SENSORS_DATA_FIRST, 12)
+	if dxl_comm_result != COMM_SUCCESS:
+		log.error("Communication error: %s", txrx_result_msg(packetHandler, dxl_comm_result))
+		return None
+	elif dxl_error != 0:
+		log.error("Error: %s", rx_packet_error_msg(packetHandler, dxl_error))
+		return None
+	else:
+		# Every 4-byte register holds two 16-bit readings, low half first
+		list_of_data = list(PAIR_STRUCT.iter_unpack(bytes(data)))
+		log.debug("Two 2-byte numbers: %s", list_of_data)
+		return list_of_data
+
+def same_file(fd, filename):
+	"""Check whether the open descriptor still refers to the file currently at filename."""
+	try:
+		path_stat = os.stat(filename)
+	except FileNotFoundError:
+		return False
+	fd_stat = os.fstat(fd)
+	return (fd_stat.st_ino, fd_stat.st_dev) == (path_stat.st_ino, path_stat.st_dev)
+
+def open_data_file(filename):
+	"""Return the cached append-only descriptor for filename, writing the header to a new file."""
+	fd = _data_fds.get(filename)
+	if fd is not None and not same_file(fd, filename):
+		# The file was moved or deleted since it was opened, start writing to the new path
+		os.close(_data_fds.pop(filename))
+		fd = None
+	if fd is None:
+		fd = os.open(filename, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+		if os.fstat(fd).st_size == 0:
+			os.write(fd, b"Sensor Data Pairs\n=================\n\n")
+		_data_fds[filename] = fd
+	return fd
+
+@atexit.register
+def close_data_files():
+	"""Close every data file opened by write_data_to_file."""
+	while _data_fds:
+		os.close(_data_fds.popitem()[1])
 
 def write_data_to_file(filename, data):
 	"""Write sensor data to a file with pairs and a control string."""
-	file_exists = os.path.isfile(filename)
-	with open(filename, 'a') as file:
-		if not file_exists:
-			file.write("Sensor Data Pairs\n")
-			file.write("=================\n\n")
-		
-		file.writelines(f"Pair {index+1}: {pair[0]:>6}, {pair[1]:>6}\n" for index, pair in enumerate(data))
-		file.write("\nEND OF DATA\n")
+	fd = open_data_file(filename)
+	buf = b"".join(PAIR_LINE_TEMPLATE % (index + 1, pair[0], pair[1]) for index, pair in enumerate(data))
+	os.write(fd, buf + b"\nEND OF DATA\n")
 
 def verify_data_written(filename):
 	"""Verify if the data was written correctly by checking the control string."""
 	if not os.path.isfile(filename):
 		return False
 	
-	with open(filename, 'r') as file:
-		return file.readlines()[-1].strip() == "END OF DATA"
+	# Only the tail of the file is needed to find the last line
+	with open(filename, 'rb') as file:
+		file.seek(0, os.SEEK_END)
+		file.seek(max(0, file.tell() - 64))
+		lines = file.read().splitlines()
+	return bool(lines) and lines[-1].strip() == b"END OF DATA"
 		
 def deinit_mes_sns(dxl_id, portHandler, packetHandler):
 	"""Deinitialize the sensor."""
-	print(f"Deinitializing measurement sensor.")
-	dxl_comm_result, dxl_error = packetHandler.write2ByteTxRx(portHandler, dxl_id, DX_MEAS_START_STOP, 0)
+	log.info("Deinitializing measurement sensor.")
+	dxl_comm_result, dxl_error = packetHandler.write1ByteTxRx(portHandler, dxl_id, DX_MEAS_START_STOP, 0)
 	if dxl_comm_result != COMM_SUCCESS:
-		print(f"Error stopping measurement: {dxl_error}")
+		log.error("Error stopping measurement: %s", dxl_error)
+	return dxl_comm_result == COMM_SUCCESS
 
 def recorder_reset(dxl_id, portHandler, packetHandler):
 	"""Reset the recorder."""
 	dxl_comm_result, dxl_error = packetHandler.write1ByteTxRx(portHandler, dxl_id, DX_RESET_CMD, 1)
 	return dxl_comm_result == COMM_SUCCESS
 
-def main():
-	portHandler, packetHandler = connect_dev(DXL_ID, BAUDRATE)
+def stop_and_reset(dxl_id, portHandler, packetHandler):
+	"""Stop the measurement, then reset the recorder."""
+	# Two separate writes keep STOP ahead of RESET and give a status reply for each;
+	# the firmware is not known to apply a multi-byte write atomically
+	if not deinit_mes_sns(dxl_id, portHandler, packetHandler):
+		return False
+	if not recorder_reset(dxl_id, portHandler, packetHandler):
+		log.error("Error resetting recorder.")
+		return False
+	return True
+
+def main(portHandler, packetHandler):
+	"""
+	Run one measurement cycle on an already connected device.
+	
+	Returns:
+		bool: True if the sensor data was written and verified, False otherwise.
+	"""
 	if portHandler and packetHandler:
-		port_name = find_port_sns(DXL_ID, portHandler, packetHandler, SNS_ETHANOL_ID)
-		if port_name:
-			toggle_sns(DXL_ID, portHandler, packetHandler, port_name)
+		port_spec = find_port_sns(DXL_ID, portHandler, packetHandler, SNS_ETHANOL_ID)
+		if port_spec:
+			if not toggle_sns(DXL_ID, portHandler, packetHandler, port_spec):
+				return False
 			sensor_data_pairs = read_sensor_data(DXL_ID, portHandler, packetHandler)
 			if sensor_data_pairs:
-				print("Sensor Data Pairs:", sensor_data_pairs)
+				log.info("Sensor Data Pairs: %s", sensor_data_pairs)
 				
 				filename = "results_term_compens.txt"
 				write_data_to_file(filename, sensor_data_pairs)
-				print(f"Data written to {filename}")
+				log.info("Data written to %s", filename)
 				
 				if verify_data_written(filename):
-					print("Data successfully written to file. Measurements can continue.")
-					deinit_mes_sns(DXL_ID, portHandler, packetHandler)
-					recorder_reset(DXL_ID, portHandler, packetHandler)
+					log.info("Data successfully written to file. Measurements can continue.")
+					# The data is saved, but a measurement left running must be reported as a failed cycle
+					return stop_and_reset(DXL_ID, portHandler, packetHandler)
 				else:
-					print("Data write verification failed. Measurements should be stopped.")
+					log.error("Data write verification failed. Measurements should be stopped.")
 		else:
-			print("Port not found. Cannot toggle sensor.")
+			log.error("Port not found. Cannot toggle sensor.")
 	else:
-		print("Failed to connect to the device.")
+		log.error("Failed to connect to the device.")
+	return False
 
 if __name__ == '__main__':
+	logging.basicConfig(level=logging.INFO, format="%(message)s")
+	portHandler, packetHandler = None, None
+	max_attempts = 3
 	try:
-		for i in range(3):
-			main()
-			alpha = input("If a mistake occurred, enter 'e' to exit, or press Enter to continue: ").strip().lower()
+		for attempt in range(max_attempts):
+			# Connect when there is no live handler (first run or after a failed run)
+			if portHandler is None:
+				portHandler, packetHandler = connect_dev(DXL_ID, BAUDRATE)
+			try:
+				if main(portHandler, packetHandler):
+					break
+			except (serial.SerialException, OSError) as e:
+				log.error("Serial error: %s.", e)
+			
+			# The handler may be stale (e.g. after a replug), rediscover the device on the next run
+			disconnect_dev(portHandler)
+			portHandler, packetHandler = None, None
+			
+			if attempt == max_attempts - 1:
+				log.error("Giving up after %d attempts.", max_attempts)
+				sys.exit(1)
+			
+			alpha = input("A mistake occurred, enter 'e' to exit, or press Enter to retry: ").strip().lower()
 			if alpha == "e":
-				print("Exiting due to user input.")
+				log.info("Exiting due to user input.")
 				sys.exit(0)
+			# Back off before the next attempt: 1 s, 2 s, ...
+			time.sleep(2 ** attempt)
 	except KeyboardInterrupt:
-		print("\nScript interrupted by user.")
-		sys.exit(0)
\ No newline at end of file
+		log.info("Script interrupted by user.")
+		sys.exit(0)